@@ -53,8 +53,7 @@ for t in t_emit:
 total_time = t_emit[-1]
 expected_dark_counts = np.random.poisson(dark_rate * total_time)
 dark_positions = np.random.choice(np.arange(num_bins), expected_dark_counts)
-for idx in dark_positions:
-    detections[idx] += 1
+detections += np.bincount(dark_positions, minlength=num_bins)
 
 # --- Plot the Final Interference Pattern ---
 plt.figure(figsize=(10, 5))
@@ -0,0 +1,166 @@
+import numpy as np
+import matplotlib.pyplot as plt
+
+# Composable detector noise stages. Each stage works in bulk on either
+#   - detection events: arrays of times and screen bins, or
+#   - a position histogram (counts per screen bin),
+# so noise costs O(events) or O(num_bins) array work instead of a Python loop.
+
+
+class DarkCounts:
+    """Dark counts: a Poisson process at dark_rate over the acquisition time, uniform across the screen."""
+
+    def __init__(self, dark_rate, num_bins):
+        self.dark_rate = dark_rate
+        self.num_bins = num_bins
+
+    def events(self, times, bins, acquisition_time, rng=np.random):
+        t_start, t_stop = acquisition_time
+        n_dark = rng.poisson(self.dark_rate * (t_stop - t_start))
+        dark_times = rng.uniform(t_start, t_stop, n_dark)
+        dark_bins = (rng.random(n_dark) * self.num_bins).astype(np.int64)
+        return np.concatenate([times, dark_times]), np.concatenate([bins, dark_bins])
+
+    def histogram(self, hist, acquisition_time, rng=np.random):
+        # Independent Poisson counts per bin, equivalent to scattering a Poisson total uniformly
+        t_start, t_stop = acquisition_time
+        mean_per_bin = self.dark_rate * (t_stop - t_start) / self.num_bins
+        return hist + rng.poisson(mean_per_bin, self.num_bins)
+
+
+class Afterpulsing:
+    """Each detection triggers an afterpulse in the same bin with the given probability.
+
+    Delays are exponential with mean delay_mean unless a delay_sampler(rng, size) is
+    given. With max_generations > 1, afterpulses can trigger afterpulses themselves.
+    Afterpulses are not gated by the detector dead time. On events, afterpulses
+    falling after the end of the acquisition window are dropped; the histogram path
+    has no timing and keeps them (a delay / acquisition-time sized effect).
+    """
+
+    def __init__(self, probability=0.01, delay_mean=1e-6, delay_sampler=None, max_generations=1):
+        self.probability = probability
+        self.delay_mean = delay_mean
+        self.delay_sampler = delay_sampler
+        self.max_generations = max_generations
+
+    def _delays(self, rng, size):
+        if self.delay_sampler is not None:
+            return self.delay_sampler(rng, size)
+        return rng.exponential(self.delay_mean, size)
+
+    def events(self, times, bins, acquisition_time, rng=np.random):
+        t_stop = acquisition_time[1]
+        all_times, all_bins = [times], [bins]
+        parent_times, parent_bins = times, bins
+        for _ in range(self.max_generations):
+            triggered = rng.random(parent_times.size) < self.probability
+            if not np.any(triggered):
+                break
+            parent_times = parent_times[triggered] + self._delays(rng, np.count_nonzero(triggered))
+            parent_bins = parent_bins[triggered]
+            # Delays are positive, so dropped afterpulses could only have spawned later ones
+            in_window = parent_times <= t_stop
+            parent_times, parent_bins = parent_times[in_window], parent_bins[in_window]
+            all_times.append(parent_times)
+            all_bins.append(parent_bins)
+        return np.concatenate(all_times), np.concatenate(all_bins)
+
+    def histogram(self, hist, acquisition_time, rng=np.random):
+        hist = np.asarray(hist)
+        parents = hist.astype(np.int64)
+        for _ in range(self.max_generations):
+            parents = rng.binomial(parents, self.probability)
+            if not np.any(parents):
+                break
+            hist = hist + parents
+        return hist
+
+
+class Jitter:
+    """Gaussian timing jitter on every detection time (position histograms are unaffected)."""
+
+    def __init__(self, jitter_std):
+        self.jitter_std = jitter_std
+
+    def events(self, times, bins, acquisition_time, rng=np.random):
+        return times + rng.normal(0, self.jitter_std, times.size), bins
+
+    def histogram(self, hist, acquisition_time, rng=np.random):
+        return hist
+
+
+class NoisePipeline:
+    """Apply noise stages in order to detection events or to a position histogram.
+
+    events() appends dark counts and afterpulses after the input events, so the
+    output is not time ordered; pass sort=True to pay for one O(n log n) sort.
+    """
+
+    def __init__(self, stages):
+        self.stages = list(stages)
+
+    def events(self, times, bins, acquisition_time, rng=np.random, sort=False):
+        times = np.asarray(times, dtype=float)
+        bins = np.asarray(bins, dtype=np.int64)
+        for stage in self.stages:
+            times, bins = stage.events(times, bins, acquisition_time, rng)
+        if sort:
+            order = np.argsort(times, kind="stable")
+            times, bins = times[order], bins[order]
+        return times, bins
+
+    def histogram(self, hist, acquisition_time, rng=np.random):
+        for stage in self.stages:
+            hist = stage.histogram(hist, acquisition_time, rng)
+        return hist
+
+
+def events_to_histogram(bins, num_bins):
+    return np.bincount(bins, minlength=num_bins)
+
+
+if __name__ == "__main__":
+    # --- Parameters (DoubleSlit.py detector) ---
+    num_pulses = 1_000_000
+    pulse_rate = 10_000          # Hz
+    num_bins = 600
+    dark_rate = 10               # false counts/sec
+    afterpulse_probability = 0.02
+    afterpulse_delay = 1e-6      # mean afterpulse delay (s)
+    jitter_std = 0.5e-9
+
+    # Clean detections: uniform times and a two-fringe toy pattern
+    t_emit = np.cumsum(np.random.exponential(scale=1 / pulse_rate, size=num_pulses))
+    x = np.linspace(-1, 1, num_bins)
+    pattern = np.cos(4 * np.pi * x) ** 2 + 1e-3
+    bins = np.searchsorted(np.cumsum(pattern) / np.sum(pattern), np.random.rand(num_pulses))
+    acquisition_time = (0.0, t_emit[-1])
+
+    pipeline = NoisePipeline([
+        DarkCounts(dark_rate, num_bins),
+        Afterpulsing(afterpulse_probability, afterpulse_delay),
+        Jitter(jitter_std),
+    ])
+    noisy_times, noisy_bins = pipeline.events(t_emit, bins, acquisition_time)
+    clean_hist = events_to_histogram(bins, num_bins)
+    noisy_hist = events_to_histogram(noisy_bins, num_bins)
+
+    # Histogram-only path: no per-event arrays at all
+    fast_hist = pipeline.histogram(clean_hist, acquisition_time)
+
+    plt.figure(figsize=(10, 5))
+    plt.plot(clean_hist, label="Clean detections", color='gray')
+    plt.plot(noisy_hist, label="Noisy (event pipeline)", color='royalblue', alpha=0.8)
+    plt.plot(fast_hist, label="Noisy (histogram pipeline)", color='darkred', alpha=0.6)
+    plt.title("Detector Noise: Dark Counts, Afterpulsing and Jitter")
+    plt.xlabel("Screen Bin")
+    plt.ylabel("Photon Counts")
+    plt.grid(True)
+    plt.legend()
+    plt.tight_layout()
+    plt.show()
+
+    print(f"Clean detections: {len(bins)}")
+    print(f"Noisy detections (events): {len(noisy_bins)}")
+    print(f"Noisy detections (histogram): {np.sum(fast_hist)}")
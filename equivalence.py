@@ -0,0 +1,444 @@
+import os
+import sys
+import random
+import tempfile
+import numpy as np
+from scipy.stats import chi2_contingency, ks_2samp
+
+import fast_kernels
+import parallel_run
+from detector_noise import DarkCounts, Afterpulsing, Jitter, NoisePipeline
+from g2_stream import StreamingCorrelator
+from time_resolved import TimeResolvedHistogram
+
+# Statistical equivalence harness: the original script loops below are kept as
+# reference oracles and run against fast_kernels on matched seeds and sizes.
+# Run `python equivalence.py`; a non-zero exit status means a check failed.
+
+# --- Tolerances ---
+p_value_min = 1e-3      # reject equivalence if a chi-square / KS test falls below this
+count_sigma_max = 5.0   # allowed |N_ref - N_fast| in units of sqrt(N_ref + N_fast)
+seed = 12345
+
+
+# -----------------------------
+# REFERENCE ORACLES (original loops)
+# -----------------------------
+def reference_double_slit(num_pulses=100_000, pulse_rate=10_000, quantum_efficiency=0.7,
+                          detector_dead_time=100e-9, dark_rate=10, jitter_std=0.5e-9, a=5e-6,
+                          lambda_eff=800e-9, d=20e-6, L=1.0, screen_width=0.04, num_bins=600):
+    """Main detection loop of DoubleSlit.py."""
+    t_emit = np.cumsum(np.random.exponential(scale=1 / pulse_rate, size=num_pulses))
+    y_screen = np.linspace(-screen_width / 2, screen_width / 2, num_bins)
+    detections = np.zeros(num_bins)
+    last_detection_time = -np.inf
+
+    for t in t_emit:
+        if t - last_detection_time < detector_dead_time:
+            continue
+
+        t += np.random.normal(0, jitter_std)
+
+        r1 = np.sqrt(L ** 2 + (y_screen + d / 2) ** 2)
+        r2 = np.sqrt(L ** 2 + (y_screen - d / 2) ** 2)
+        delta_r = r1 - r2
+        interference = np.cos(np.pi * delta_r / lambda_eff) ** 2
+        sinc_arg = np.pi * a * y_screen / (lambda_eff * L)
+        envelope = (np.sinc(sinc_arg / np.pi)) ** 2
+        probabilities = quantum_efficiency * interference * envelope
+        probabilities /= np.sum(probabilities)
+
+        chosen_bin = np.random.choice(np.arange(num_bins), p=probabilities)
+        detections[chosen_bin] += 1
+        last_detection_time = t
+
+    total_time = t_emit[-1]
+    expected_dark_counts = np.random.poisson(dark_rate * total_time)
+    dark_positions = np.random.choice(np.arange(num_bins), expected_dark_counts)
+    for idx in dark_positions:
+        detections[idx] += 1
+    return y_screen, detections
+
+
+def reference_pulse_slit(num_pulses=1_000_000, L=1.0, screen_width=0.01, num_bins=1000,
+                         slit_sep=1e-3, slit_width=10e-6, angular_spread=1e-3, position_spread=0.5e-3,
+                         pulse_rate=None, dark_time=0.0):
+    """Pulse loop of pulse_dead_time.py (pulse_rate=None) and pulse_no_dead_time.py."""
+    bin_positions = np.linspace(-screen_width / 2, screen_width / 2, num_bins)
+    slit_centers = np.array([-slit_sep / 2, slit_sep / 2])
+    detections = np.zeros(num_bins, dtype=int)
+
+    if pulse_rate is None:
+        event_times = np.zeros(num_pulses)  # untimed: dark_time never applies
+    else:
+        event_times = np.cumsum(np.random.exponential(1 / pulse_rate, num_pulses))
+    last_detection_time = -np.inf
+
+    for current_time in event_times:
+        if current_time - last_detection_time < dark_time:
+            continue
+
+        origin_offset = np.random.normal(0, position_spread)
+        angle = np.random.normal(0, angular_spread / 2)
+        x_hit = origin_offset + L * np.tan(angle)
+
+        through_slit = False
+        for center in slit_centers:
+            if np.abs(origin_offset - center) <= slit_width / 2:
+                through_slit = True
+                break
+        if not through_slit:
+            continue
+
+        bin_idx = np.argmin(np.abs(bin_positions - x_hit))
+        if 0 <= bin_idx < num_bins:
+            detections[bin_idx] += 1
+            last_detection_time = current_time
+    return bin_positions, detections
+
+
+def reference_detect_pulses(t_emit, eta, dead):
+    """detect_pulses from coincidence.py."""
+    detections = []
+    last_t = -np.inf
+    for t in t_emit:
+        if t - last_t < dead:
+            continue
+        if np.random.rand() < eta:
+            detections.append(t)
+            last_t = t
+    return np.array(detections)
+
+
+def reference_coincidence_histogram(detector_A, detector_B, window_size=1.0, bin_width=0.01):
+    """τ histogram loop from coincidence.py."""
+    taus = []
+    for t1 in detector_A:
+        mask = np.abs(detector_B - t1) <= window_size
+        taus.extend(detector_B[mask] - t1)
+    bins = np.arange(-window_size, window_size + bin_width, bin_width)
+    hist, edges = np.histogram(np.array(taus), bins=bins)
+    return (edges[:-1] + edges[1:]) / 2, hist
+
+
+def reference_dead_time_filter(times, dead_time, offsets):
+    """Scalar dead-time loop with jittered detection times, as in DoubleSlit.py."""
+    accepted = np.zeros(len(times), dtype=bool)
+    last_detection_time = -np.inf
+    for i, t in enumerate(times):
+        if t - last_detection_time < dead_time:
+            continue
+        accepted[i] = True
+        last_detection_time = t + offsets[i]
+    return accepted
+
+
+def reference_simulate_transitions(n_max=10, trials=20000):
+    """simulate_transitions from spectra.py."""
+    transitions = {}
+    for _ in range(trials):
+        n = random.randint(2, n_max)
+        m_choices = [i for i in range(1, n)]
+        m = random.choice(m_choices)
+        delta_l = abs((n - 1) - (m - 1))
+        if delta_l == 1:
+            E_n = -13.6 / n**2
+            E_m = -13.6 / m**2
+            delta_E = abs(E_n - E_m)
+            label = f"{n} → {m}"
+            transitions.setdefault(label, []).append(delta_E)
+    return transitions
+
+
+def reference_simulate_absorption_spectrum(n_max=10, trials=20000):
+    """simulate_absorption_spectrum from spectra.py."""
+    allowed_transitions = []
+    for _ in range(trials):
+        m = random.randint(1, n_max - 1)
+        n_choices = [i for i in range(m + 1, n_max + 1)]
+        n = random.choice(n_choices)
+        delta_l = abs((n - 1) - (m - 1))
+        if delta_l == 1:
+            E_m = -13.6 / m**2
+            E_n = -13.6 / n**2
+            delta_E = abs(E_n - E_m)
+            allowed_transitions.append(delta_E)
+    return allowed_transitions
+
+
+# -----------------------------
+# COMPARISONS
+# -----------------------------
+def histograms_equivalent(ref_counts, fast_counts):
+    """Two-sample chi-square on histogram shape plus a total-count check."""
+    ref_counts = np.asarray(ref_counts, dtype=float)
+    fast_counts = np.asarray(fast_counts, dtype=float)
+    occupied = (ref_counts + fast_counts) > 0
+    _, p_value, _, _ = chi2_contingency(np.vstack([ref_counts[occupied], fast_counts[occupied]]))
+    n_ref, n_fast = ref_counts.sum(), fast_counts.sum()
+    count_sigma = abs(n_ref - n_fast) / np.sqrt(n_ref + n_fast)
+    passed = p_value >= p_value_min and count_sigma <= count_sigma_max
+    return passed, f"chi2 p={p_value:.3g}, counts {n_ref:.0f} vs {n_fast:.0f} ({count_sigma:.2f}σ)"
+
+
+def samples_equivalent(ref_samples, fast_samples):
+    """Two-sample KS test plus a total-count check."""
+    _, p_value = ks_2samp(ref_samples, fast_samples)
+    n_ref, n_fast = len(ref_samples), len(fast_samples)
+    count_sigma = abs(n_ref - n_fast) / np.sqrt(n_ref + n_fast)
+    passed = p_value >= p_value_min and count_sigma <= count_sigma_max
+    return passed, f"KS p={p_value:.3g}, counts {n_ref} vs {n_fast} ({count_sigma:.2f}σ)"
+
+
+def exactly_equal(ref, fast):
+    ref, fast = np.asarray(ref), np.asarray(fast)
+    passed = ref.shape == fast.shape and np.array_equal(ref, fast)
+    return passed, "identical" if passed else "arrays differ"
+
+
+# -----------------------------
+# CHECKS
+# -----------------------------
+def check_dead_time_filter_exact():
+    rng = np.random.default_rng(seed)
+    times = np.cumsum(rng.exponential(1 / 1_000_000, 200_000))
+    offsets = rng.normal(0, 0.5e-6, times.size)
+    return exactly_equal(reference_dead_time_filter(times, 2e-6, offsets),
+                         fast_kernels.dead_time_filter(times, 2e-6, offsets=offsets))
+
+
+def check_pulse_dead_time_exact():
+    np.random.seed(seed)
+    _, ref = reference_pulse_slit(num_pulses=200_000)
+    np.random.seed(seed)
+    _, fast = fast_kernels.pulse_slit(num_pulses=200_000)
+    return exactly_equal(ref, fast)
+
+
+def check_pulse_no_dead_time_exact():
+    np.random.seed(seed)
+    _, ref = reference_pulse_slit(num_pulses=200_000, pulse_rate=1_000_000, dark_time=0.0)
+    np.random.seed(seed)
+    _, fast = fast_kernels.pulse_slit(num_pulses=200_000, pulse_rate=1_000_000, dark_time=0.0)
+    return exactly_equal(ref, fast)
+
+
+def check_pulse_no_dead_time_statistical():
+    # Wider slits so the dead time actually binds at this sample size
+    kwargs = dict(num_pulses=200_000, slit_width=200e-6, pulse_rate=1_000_000, dark_time=10e-6)
+    np.random.seed(seed)
+    _, ref = reference_pulse_slit(**kwargs)
+    _, fast = fast_kernels.pulse_slit(rng=np.random.default_rng(seed), **kwargs)
+    return histograms_equivalent(ref, fast)
+
+
+def check_double_slit_statistical():
+    kwargs = dict(num_pulses=20_000, detector_dead_time=50e-6)
+    np.random.seed(seed)
+    _, ref = reference_double_slit(**kwargs)
+    _, fast = fast_kernels.double_slit(rng=np.random.default_rng(seed), **kwargs)
+    return histograms_equivalent(ref, fast)
+
+
+def check_detect_pulses_exact():
+    np.random.seed(seed)
+    t_emit = np.cumsum(np.random.exponential(scale=1 / 20, size=20_000))
+    state = np.random.get_state()
+    ref = reference_detect_pulses(t_emit, 0.7, 0.0)
+    np.random.set_state(state)
+    fast = fast_kernels.detect_pulses(t_emit, 0.7, 0.0)
+    return exactly_equal(ref, fast)
+
+
+def check_detect_pulses_statistical():
+    np.random.seed(seed)
+    t_emit = np.cumsum(np.random.exponential(scale=1 / 20, size=50_000))
+    ref = reference_detect_pulses(t_emit, 0.7, 0.05)
+    fast = fast_kernels.detect_pulses(t_emit, 0.7, 0.05, rng=np.random.default_rng(seed))
+    return samples_equivalent(np.diff(ref), np.diff(fast))
+
+
+def check_coincidence_exact():
+    np.random.seed(seed)
+    t_emit = np.cumsum(np.random.exponential(scale=1 / 20, size=5_000))
+    detector_A = reference_detect_pulses(t_emit, 0.7, 0.05)
+    detector_B = reference_detect_pulses(t_emit, 0.7, 0.05)
+    _, ref = reference_coincidence_histogram(detector_A, detector_B)
+    _, fast = fast_kernels.coincidence_histogram(detector_A, detector_B)
+    return exactly_equal(ref, fast)
+
+
+def check_coincidence_streaming_exact():
+    # Feed both channels in randomly sized, randomly interleaved chunks so pairs
+    # straddling chunk boundaries are exercised; a small max_pairs splits most
+    # chunks into several pair batches
+    np.random.seed(seed)
+    t_emit = np.cumsum(np.random.exponential(scale=1 / 20, size=5_000))
+    detector_A = reference_detect_pulses(t_emit, 0.7, 0.05)
+    detector_B = reference_detect_pulses(t_emit, 0.7, 0.05)
+    _, ref = reference_coincidence_histogram(detector_A, detector_B)
+
+    rng = np.random.default_rng(seed)
+    correlator = StreamingCorrelator(window_size=1.0, bin_width=0.01, max_pairs=500)
+    i_A = i_B = 0
+    while i_A < detector_A.size or i_B < detector_B.size:
+        n = int(rng.integers(1, 200))
+        if i_B >= detector_B.size or (i_A < detector_A.size and rng.random() < 0.5):
+            correlator.add_A(detector_A[i_A:i_A + n])
+            i_A += n
+        else:
+            correlator.add_B(detector_B[i_B:i_B + n])
+            i_B += n
+    return exactly_equal(ref, correlator.histogram()[1])
+
+
+def check_transitions_exact():
+    # Same label set, and every sampled energy under a label equals the reference value
+    random.seed(seed)
+    ref = reference_simulate_transitions()
+    fast = fast_kernels.simulate_transitions(rng=np.random.default_rng(seed))
+    ref_lines = {label: np.unique(energies) for label, energies in ref.items()}
+    fast_lines = {label: np.unique(energies) for label, energies in fast.items() if len(energies)}
+    passed = (ref_lines.keys() == fast_lines.keys()
+              and all(np.array_equal(ref_lines[label], fast_lines[label]) for label in ref_lines))
+    return passed, f"{len(ref_lines)} labels, energies identical" if passed else "labels or energies differ"
+
+
+def check_transitions_statistical():
+    random.seed(seed)
+    ref = reference_simulate_transitions(trials=200_000)
+    fast = fast_kernels.simulate_transitions(trials=200_000, rng=np.random.default_rng(seed))
+    labels = sorted(set(ref) | set(fast))
+    return histograms_equivalent([len(ref.get(label, [])) for label in labels],
+                                 [len(fast.get(label, [])) for label in labels])
+
+
+def check_absorption_statistical():
+    random.seed(seed)
+    ref = np.array(reference_simulate_absorption_spectrum(trials=200_000))
+    fast = fast_kernels.simulate_absorption_spectrum(trials=200_000, rng=np.random.default_rng(seed))
+    lines = np.union1d(ref, fast)
+    return histograms_equivalent([np.sum(ref == e) for e in lines], [np.sum(fast == e) for e in lines])
+
+
+def check_parallel_stitching_exact():
+    # Long dead time so segment heads are non-trivial; noise off so only stitching is
+    # compared. Fewer pulses than workers leaves some segments empty.
+    cases = [("double_slit", dict(num_pulses=400_000, n_workers=4, seed=seed, chunk_size=50_000,
+                                  detector_dead_time=50e-6)),
+             ("pulse_slit", dict(num_pulses=3, n_workers=4, seed=seed)),
+             ("double_slit", dict(num_pulses=3, n_workers=4, seed=seed))]
+    for kind, kwargs in cases:
+        _, parallel = parallel_run.parallel_run(kind, noise=NoisePipeline([]), **kwargs)
+        _, serial = parallel_run.serial_run(kind, **kwargs)
+        passed, detail = exactly_equal(serial, parallel)
+        if not passed:
+            return passed, f"{kind}, {kwargs['num_pulses']} pulses: {detail}"
+    return passed, detail
+
+
+def check_noise_paths_statistical():
+    # Event pipeline binned afterwards vs the bulk histogram pipeline, same parameters
+    # and independent clean detections; short afterpulse delays so the t_stop cut
+    # removes a negligible number
+    num_bins, acquisition_time = 200, (0.0, 100.0)
+    pipeline = NoisePipeline([DarkCounts(2_000, num_bins), Afterpulsing(0.05, 1e-6, max_generations=2),
+                              Jitter(0.5e-9)])
+    rng = np.random.default_rng(seed)
+    pattern = np.linspace(1, 2, num_bins)
+    bins = fast_kernels.sample_bins(pattern, rng.random(200_000))
+    times = np.sort(rng.uniform(*acquisition_time, bins.size))
+    _, event_bins = pipeline.events(times, bins, acquisition_time, rng)
+    clean = np.bincount(fast_kernels.sample_bins(pattern, rng.random(bins.size)), minlength=num_bins)
+    hist = pipeline.histogram(clean, acquisition_time, rng)
+    return histograms_equivalent(np.bincount(event_bins, minlength=num_bins), hist)
+
+
+def check_dark_rate_count():
+    dark_rate, duration = 1_000, 500.0
+    times, _ = DarkCounts(dark_rate, 100).events(np.empty(0), np.empty(0, np.int64), (0.0, duration),
+                                                 np.random.default_rng(seed))
+    expected = dark_rate * duration
+    count_sigma = abs(times.size - expected) / np.sqrt(expected)
+    return count_sigma <= count_sigma_max, f"{times.size} vs {expected:.0f} expected ({count_sigma:.2f}σ)"
+
+
+def check_afterpulse_delays_statistical():
+    # Every parent at t = 0, so afterpulse times are the delays themselves
+    rng = np.random.default_rng(seed)
+    parents = np.zeros(200_000)
+    times, _ = Afterpulsing(0.1, 1e-6).events(parents, np.zeros(parents.size, np.int64), (0.0, 1.0), rng)
+    return samples_equivalent(rng.exponential(1e-6, int(0.1 * parents.size)), times[parents.size:])
+
+
+def check_afterpulse_window_count():
+    # Delays comparable to the window: afterpulses past t_stop must be dropped, and
+    # the kept number must match sum_i p (1 - exp(-(t_stop - t_i) / delay_mean))
+    probability, delay_mean, t_stop = 0.2, 2.0, 10.0
+    rng = np.random.default_rng(seed)
+    parents = np.sort(rng.uniform(0.0, t_stop, 100_000))
+    times, _ = Afterpulsing(probability, delay_mean).events(parents, np.zeros(parents.size, np.int64),
+                                                           (0.0, t_stop), rng)
+    afterpulses = times[parents.size:]
+    expected = probability * np.sum(1 - np.exp(-(t_stop - parents) / delay_mean))
+    count_sigma = abs(afterpulses.size - expected) / np.sqrt(expected)
+    n_late = np.count_nonzero(afterpulses > t_stop)
+    passed = n_late == 0 and count_sigma <= count_sigma_max
+    return passed, f"{n_late} past t_stop, {afterpulses.size} vs {expected:.0f} expected ({count_sigma:.2f}σ)"
+
+
+def check_time_resolved_exact():
+    # Chunked noisy run: the time-resolved histogram, read back before anything is
+    # written and again after close, must sum over time to the returned 1D histograms
+    kwargs = dict(num_pulses=2_000, dark_rate=1_000, num_bins=200)
+    passed = True
+    with tempfile.TemporaryDirectory() as tmp:
+        for path in (os.path.join(tmp, "hist2d.bin"), None):
+            hist2d = TimeResolvedHistogram(kwargs["num_bins"], 0.5, path=path)
+            rng = np.random.default_rng(seed)
+            state = {"t_end": 0.0, "last_detection_time": -np.inf}
+            _, total = fast_kernels.double_slit(state=state, time_resolved=hist2d, rng=rng, **kwargs)
+            passed &= hist2d.first_open == 0 and np.array_equal(hist2d.counts().sum(axis=0), total)
+            for _ in range(10):
+                _, detections = fast_kernels.double_slit(state=state, time_resolved=hist2d, rng=rng, **kwargs)
+                total += detections
+            hist2d.close()
+            passed &= hist2d.first_open > 0 and np.array_equal(hist2d.counts().sum(axis=0), total)
+    return passed, "slice totals match 1D histograms" if passed else "slice totals differ"
+
+
+CHECKS = [
+    ("dead-time filter (exact)", check_dead_time_filter_exact),
+    ("pulse_dead_time.py (exact)", check_pulse_dead_time_exact),
+    ("pulse_no_dead_time.py, dark_time=0 (exact)", check_pulse_no_dead_time_exact),
+    ("pulse_no_dead_time.py, dark_time>0 (chi-square)", check_pulse_no_dead_time_statistical),
+    ("DoubleSlit.py (chi-square)", check_double_slit_statistical),
+    ("coincidence.py detect_pulses, dead=0 (exact)", check_detect_pulses_exact),
+    ("coincidence.py detect_pulses, dead>0 (KS)", check_detect_pulses_statistical),
+    ("coincidence.py τ histogram (exact)", check_coincidence_exact),
+    ("g2_stream chunked τ histogram (exact)", check_coincidence_streaming_exact),
+    ("spectra.py transition labels and energies (exact)", check_transitions_exact),
+    ("spectra.py emission lines (chi-square)", check_transitions_statistical),
+    ("spectra.py absorption lines (chi-square)", check_absorption_statistical),
+    ("parallel_run segment stitching (exact)", check_parallel_stitching_exact),
+    ("time_resolved slices vs 1D histogram (exact)", check_time_resolved_exact),
+    ("detector_noise events vs histogram path (chi-square)", check_noise_paths_statistical),
+    ("detector_noise dark count rate (count)", check_dark_rate_count),
+    ("detector_noise afterpulse delays (KS)", check_afterpulse_delays_statistical),
+    ("detector_noise afterpulses within t_stop (count)", check_afterpulse_window_count),
+]
+
+
+def run_checks(checks=CHECKS):
+    failures = 0
+    for name, check in checks:
+        passed, detail = check()
+        failures += not passed
+        print(f"[{'PASS' if passed else 'FAIL'}] {name}: {detail}")
+    return failures
+
+
+if __name__ == "__main__":
+    failures = run_checks()
+    print(f"{len(CHECKS) - failures}/{len(CHECKS)} equivalence checks passed")
+    sys.exit(1 if failures else 0)
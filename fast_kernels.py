@@ -0,0 +1,211 @@
+import numpy as np
+
+from detector_noise import DarkCounts, NoisePipeline
+from g2_stream import StreamingCorrelator
+
+# Vectorized engines for the per-pulse loops in DoubleSlit.py, pulse_dead_time.py,
+# pulse_no_dead_time.py, coincidence.py and spectra.py. Every function takes an
+# `rng` with the np.random API (the global module, a RandomState or a Generator)
+# and is checked against the original loops by equivalence.py.
+
+
+def dead_time_filter(times, dead_time, offsets=None, last_detection_time=-np.inf):
+    """Non-paralyzable dead time over candidate detections, exactly as the script loops apply it.
+
+    A candidate at times[i] is accepted unless it falls within dead_time of the most
+    recently accepted detection, whose recorded time is times[j] + offsets[j]
+    (offsets model jitter on the stored detection time, as in DoubleSlit.py).
+    Returns a boolean acceptance mask.
+    """
+    times = np.asarray(times, dtype=float)
+    n = times.size
+    if n == 0:
+        return np.zeros(0, dtype=bool)
+    release = times if offsets is None else times + offsets
+
+    # Upper bound on the last recorded time before each candidate: if even that is
+    # far enough back, the candidate is accepted whatever happened before it.
+    prior = np.empty(n)
+    prior[0] = last_detection_time
+    prior[1:] = np.maximum(np.maximum.accumulate(release)[:-1], last_detection_time)
+    accepted = times - prior >= dead_time
+
+    # Resolve the remaining (clustered) candidates one by one
+    free_idx = np.where(accepted, np.arange(n), -1)
+    last_free = np.maximum.accumulate(free_idx)
+    last_resolved = -1
+    for i in np.flatnonzero(~accepted):
+        j = max(last_free[i - 1] if i > 0 else -1, last_resolved)
+        last = release[j] if j >= 0 else last_detection_time
+        if not times[i] - last < dead_time:
+            accepted[i] = True
+            last_resolved = i
+    return accepted
+
+
+def nearest_bin(bin_positions, x):
+    """Vectorized np.argmin(np.abs(bin_positions - x)) for sorted bin_positions (ties go low)."""
+    x = np.asarray(x, dtype=float)
+    right = np.clip(np.searchsorted(bin_positions, x), 1, len(bin_positions) - 1)
+    left = right - 1
+    take_left = np.abs(bin_positions[left] - x) <= np.abs(bin_positions[right] - x)
+    return np.where(take_left, left, right)
+
+
+def double_slit_probabilities(y_screen, quantum_efficiency, a, lambda_eff, d, L):
+    """Normalized screen-bin probabilities of DoubleSlit.py (interference × diffraction envelope)."""
+    r1 = np.sqrt(L ** 2 + (y_screen + d / 2) ** 2)
+    r2 = np.sqrt(L ** 2 + (y_screen - d / 2) ** 2)
+    interference = np.cos(np.pi * (r1 - r2) / lambda_eff) ** 2
+    envelope = np.sinc(np.pi * a * y_screen / (lambda_eff * L) / np.pi) ** 2
+    probabilities = quantum_efficiency * interference * envelope
+    return probabilities / np.sum(probabilities)
+
+
+def sample_bins(probabilities, u):
+    """Inverse-CDF bin choice for uniforms u in [0, 1), equivalent to np.random.choice(p=...)."""
+    cdf = np.cumsum(probabilities)
+    return np.minimum(np.searchsorted(cdf, u * cdf[-1], side="right"), len(probabilities) - 1)
+
+
+def double_slit(num_pulses=100_000, pulse_rate=10_000, quantum_efficiency=0.7,
+                detector_dead_time=100e-9, dark_rate=10, jitter_std=0.5e-9, a=5e-6,
+                lambda_eff=800e-9, d=20e-6, L=1.0, screen_width=0.04, num_bins=600,
+                noise=None, state=None, time_resolved=None, rng=np.random):
+    """Vectorized DoubleSlit.py: returns (y_screen, detections).
+
+    `noise` is a detector_noise.NoisePipeline; by default it adds dark counts at
+    dark_rate as DoubleSlit.py does.
+    `state` is a dict carrying "t_end" and "last_detection_time" between calls, so a
+    long run can be simulated in chunks. `time_resolved` is a
+    time_resolved.TimeResolvedHistogram fed with the jittered detection times. When it
+    is given, noise goes through the event path so the time-resolved histogram sees
+    the same dark counts and afterpulses as the returned 1D histogram.
+    """
+    if state is None:
+        state = {"t_end": 0.0, "last_detection_time": -np.inf}
+    t_start = state["t_end"]
+    t_emit = t_start + np.cumsum(rng.exponential(scale=1 / pulse_rate, size=num_pulses))
+    y_screen = np.linspace(-screen_width / 2, screen_width / 2, num_bins)
+
+    # The detection pattern does not depend on t, so build it once
+    probabilities = double_slit_probabilities(y_screen, quantum_efficiency, a, lambda_eff, d, L)
+
+    jitter = rng.normal(0, jitter_std, size=num_pulses)
+    accepted = dead_time_filter(t_emit, detector_dead_time, offsets=jitter,
+                                last_detection_time=state["last_detection_time"])
+    detection_times = t_emit[accepted] + jitter[accepted]
+
+    chosen_bins = sample_bins(probabilities, rng.random(detection_times.size))
+
+    # Dark counts (plus any extra noise stages): on the histogram in bulk, or on
+    # events when the time-resolved output needs their timing
+    if noise is None:
+        noise = NoisePipeline([DarkCounts(dark_rate, num_bins)])
+    acquisition_time = (t_start, t_emit[-1])
+    if time_resolved is not None:
+        noisy_times, noisy_bins = noise.events(detection_times, chosen_bins, acquisition_time, rng)
+        time_resolved.add(noisy_times, noisy_bins)
+        detections = np.bincount(noisy_bins, minlength=num_bins).astype(float)
+    else:
+        detections = np.bincount(chosen_bins, minlength=num_bins).astype(float)
+        detections = noise.histogram(detections, acquisition_time, rng)
+
+    state["t_end"] = t_emit[-1]
+    if detection_times.size:
+        state["last_detection_time"] = detection_times[-1]
+    return y_screen, detections
+
+
+def slit_hits(num_pulses, L, slit_sep, slit_width, angular_spread, position_spread, rng=np.random):
+    """Screen hit positions and slit-passage mask for num_pulses emitted pulses."""
+    slit_centers = np.array([-slit_sep / 2, slit_sep / 2])
+
+    # (origin_offset, angle) pairs, interleaved like the loop's draws
+    draws = rng.normal(0, [position_spread, angular_spread / 2], size=(num_pulses, 2))
+    origin_offset, angle = draws[:, 0], draws[:, 1]
+    x_hit = origin_offset + L * np.tan(angle)
+
+    through_slit = np.zeros(num_pulses, dtype=bool)
+    for center in slit_centers:
+        through_slit |= np.abs(origin_offset - center) <= slit_width / 2
+    return x_hit, through_slit
+
+
+def pulse_slit(num_pulses=1_000_000, L=1.0, screen_width=0.01, num_bins=1000,
+               slit_sep=1e-3, slit_width=10e-6, angular_spread=1e-3, position_spread=0.5e-3,
+               pulse_rate=None, dark_time=0.0, state=None, time_resolved=None, rng=np.random):
+    """Vectorized pulse_dead_time.py (pulse_rate=None) and pulse_no_dead_time.py.
+
+    With no timing, or with dark_time=0, the random draws are consumed in the same
+    order as the loop, so a matching seed reproduces the loop histogram exactly.
+    `state` and `time_resolved` work as in double_slit (timed runs only).
+    Returns (bin_positions, detections).
+    """
+    if state is None:
+        state = {"t_end": 0.0, "last_detection_time": -np.inf}
+    bin_positions = np.linspace(-screen_width / 2, screen_width / 2, num_bins)
+
+    if pulse_rate is not None:
+        event_times = state["t_end"] + np.cumsum(rng.exponential(1 / pulse_rate, num_pulses))
+
+    x_hit, through_slit = slit_hits(num_pulses, L, slit_sep, slit_width, angular_spread,
+                                    position_spread, rng)
+
+    # Only registered detections restart the dead time
+    hits = np.flatnonzero(through_slit)
+    if pulse_rate is not None and dark_time > 0:
+        hits = hits[dead_time_filter(event_times[hits], dark_time,
+                                     last_detection_time=state["last_detection_time"])]
+
+    bin_idx = nearest_bin(bin_positions, x_hit[hits])
+    detections = np.bincount(bin_idx, minlength=num_bins)
+
+    if pulse_rate is not None:
+        if time_resolved is not None:
+            time_resolved.add(event_times[hits], bin_idx)
+        state["t_end"] = event_times[-1]
+        if hits.size:
+            state["last_detection_time"] = event_times[hits[-1]]
+    return bin_positions, detections
+
+
+def detect_pulses(t_emit, eta, dead, rng=np.random):
+    """Vectorized detect_pulses from coincidence.py (exact draw order when dead == 0)."""
+    t_emit = np.asarray(t_emit, dtype=float)
+    candidates = t_emit[rng.random(t_emit.size) < eta]
+    if dead > 0:
+        candidates = candidates[dead_time_filter(candidates, dead)]
+    return candidates
+
+
+def coincidence_histogram(detector_A, detector_B, window_size=1.0, bin_width=0.01):
+    """τ histogram of coincidence.py, computed with sorted searches instead of a mask per tag."""
+    correlator = StreamingCorrelator(window_size=window_size, bin_width=bin_width)
+    correlator.add_A(np.sort(detector_A))
+    correlator.add_B(np.sort(detector_B))
+    return correlator.histogram()
+
+
+def _transition_energies(n, m):
+    E_n = -13.6 / n**2
+    E_m = -13.6 / m**2
+    return np.abs(E_n - E_m)
+
+
+def simulate_transitions(n_max=10, trials=20000, rng=np.random):
+    """Vectorized spectra.simulate_transitions: returns {label: array of ΔE}."""
+    n = 2 + (rng.random(trials) * (n_max - 1)).astype(np.int64)
+    m = 1 + (rng.random(trials) * (n - 1)).astype(np.int64)
+    keep = np.abs((n - 1) - (m - 1)) == 1
+    n, m = n[keep], m[keep]
+    delta_E = _transition_energies(n, m)
+    return {f"{upper} → {upper - 1}": delta_E[n == upper] for upper in np.unique(n)}
+
+
+def simulate_absorption_spectrum(n_max=10, trials=20000, rng=np.random):
+    """Vectorized spectra.simulate_absorption_spectrum: returns an array of ΔE."""
+    m = 1 + (rng.random(trials) * (n_max - 1)).astype(np.int64)
+    n = m + 1 + (rng.random(trials) * (n_max - m)).astype(np.int64)
+    keep = np.abs((n - 1) - (m - 1)) == 1
+    return _transition_energies(n[keep], m[keep])
@@ -0,0 +1,153 @@
+import numpy as np
+import matplotlib.pyplot as plt
+
+
+class StreamingCorrelator:
+    """Online g²(τ) accumulator for two time-tag channels fed in chunks.
+
+    Each channel's chunks must arrive in time order, but the two channels
+    may be interleaved arbitrarily. A pair (t_A, t_B) with |t_B - t_A| <= window_size
+    is counted exactly once, when the later-arriving of its two tags is added,
+    so pairs that straddle chunk boundaries match the full-array result.
+    At most max_pairs τ values are materialized at a time, so peak memory does not
+    grow with the chunk size or the count rate.
+    """
+
+    def __init__(self, window_size=1.0, bin_width=0.01, max_pairs=1_000_000):
+        self.window_size = window_size
+        self.bin_width = bin_width
+        self.max_pairs = max_pairs
+        # Same binning as coincidence.py / antibunching.py
+        self.bins = np.arange(-window_size, window_size + bin_width, bin_width)
+        self.bin_centers = (self.bins[:-1] + self.bins[1:]) / 2
+        self.hist = np.zeros(len(self.bins) - 1, dtype=np.int64)
+        self.counts = {"A": 0, "B": 0}
+        self.last_time = {"A": -np.inf, "B": -np.inf}
+        # Tail buffers: only tags that can still pair with future arrivals
+        self.tail = {"A": np.empty(0), "B": np.empty(0)}
+
+    def add_A(self, times):
+        self._add("A", times)
+
+    def add_B(self, times):
+        self._add("B", times)
+
+    def _add(self, channel, times):
+        times = np.asarray(times, dtype=float)
+        if times.size == 0:
+            return
+        if times[0] < self.last_time[channel] or np.any(np.diff(times) < 0):
+            raise ValueError(f"Channel {channel} time tags must arrive in increasing order")
+        other = "B" if channel == "A" else "A"
+
+        # Correlate the new tags against the other channel's tail
+        self._accumulate(times, self.tail[other], sign=1 if channel == "A" else -1)
+
+        self.counts[channel] += times.size
+        self.last_time[channel] = times[-1]
+        self.tail[channel] = np.concatenate([self.tail[channel], times])
+
+        # Future tags on `channel` are >= last_time, so older tags on `other` are finished
+        self.tail[other] = self._prune(self.tail[other], self.last_time[channel])
+        self.tail[channel] = self._prune(self.tail[channel], self.last_time[other])
+
+    def _prune(self, buffer, horizon):
+        start = np.searchsorted(buffer, horizon - self.window_size - self.bin_width, side="left")
+        return buffer[start:]
+
+    def _accumulate(self, new, buffer, sign):
+        """Histogram τ = t_B - t_A for every new tag against the buffered tags."""
+        if buffer.size == 0:
+            return
+        # Search slightly wide, then apply the exact |τ| <= window_size cut
+        reach = self.window_size + self.bin_width
+        lo = np.searchsorted(buffer, new - reach, side="left")
+        hi = np.searchsorted(buffer, new + reach, side="right")
+        n_pairs = hi - lo
+        cum_pairs = np.cumsum(n_pairs)
+        if cum_pairs[-1] == 0:
+            return
+        # Sub-batches of new tags holding about max_pairs pairs each (at least one tag)
+        start = 0
+        while start < new.size:
+            done = cum_pairs[start - 1] if start else 0
+            stop = max(np.searchsorted(cum_pairs, done + self.max_pairs, side="right"), start + 1)
+            self._histogram_pairs(new[start:stop], buffer, lo[start:stop], n_pairs[start:stop], sign)
+            start = stop
+
+    def _histogram_pairs(self, new, buffer, lo, n_pairs, sign):
+        total = np.sum(n_pairs)
+        if total == 0:
+            return
+        # Flat index into buffer for each (new, partner) pair
+        owner = np.repeat(np.arange(new.size), n_pairs)
+        offsets = np.arange(total) - np.repeat(np.cumsum(n_pairs) - n_pairs, n_pairs)
+        partners = buffer[lo[owner] + offsets]
+        taus = sign * (partners - new[owner])
+        taus = taus[np.abs(taus) <= self.window_size]
+        self.hist += np.histogram(taus, bins=self.bins)[0]
+
+    def histogram(self):
+        return self.bin_centers, self.hist.copy()
+
+    def g2(self):
+        """Current g²(τ), normalized to the mean bin count as in coincidence.py."""
+        mean_counts = np.mean(self.hist)
+        if mean_counts == 0:
+            return self.bin_centers, np.zeros_like(self.hist, dtype=float)
+        return self.bin_centers, self.hist / mean_counts
+
+
+if __name__ == "__main__":
+    # --- Parameters ---
+    num_chunks = 40
+    pulses_per_chunk = 5_000
+    pulse_rate = 20  # avg pulses/sec
+    quantum_efficiency = 0.7
+    dead_time = 0.05
+    window_size = 1.0
+    bin_width = 0.01
+
+    correlator = StreamingCorrelator(window_size=window_size, bin_width=bin_width)
+    last_t = {"A": -np.inf, "B": -np.inf}
+    t_offset = 0.0
+    snapshots = []
+
+    # --- Stream time tags chunk by chunk ---
+    for chunk in range(num_chunks):
+        t_emit = t_offset + np.cumsum(np.random.exponential(scale=1 / pulse_rate, size=pulses_per_chunk))
+        t_offset = t_emit[-1]
+
+        for channel in ("A", "B"):
+            detections = []
+            for t in t_emit:
+                if t - last_t[channel] < dead_time:
+                    continue
+                if np.random.rand() < quantum_efficiency:
+                    detections.append(t)
+                    last_t[channel] = t
+            if channel == "A":
+                correlator.add_A(detections)
+            else:
+                correlator.add_B(detections)
+
+        if (chunk + 1) % (num_chunks // 4) == 0:
+            snapshots.append((chunk + 1, correlator.g2()[1]))
+
+    bin_centers, g2_tau = correlator.g2()
+
+    # --- Plot convergence ---
+    plt.figure(figsize=(10, 5))
+    for n_done, g2_snapshot in snapshots:
+        plt.plot(bin_centers, g2_snapshot, drawstyle='steps-mid', alpha=0.6, label=f"{n_done} chunks")
+    plt.axhline(1.0, color='gray', linestyle='--', label="Poissonian baseline (g²=1)")
+    plt.title("Streaming g²(τ) Convergence")
+    plt.xlabel("Delay τ (seconds)")
+    plt.ylabel("g²(τ)")
+    plt.grid(True)
+    plt.legend()
+    plt.show()
+
+    print(f"Detector A: {correlator.counts['A']} detections")
+    print(f"Detector B: {correlator.counts['B']} detections")
+    print(f"Total coincidences measured: {np.sum(correlator.hist)}")
@@ -0,0 +1,291 @@
+from abc import ABC, abstractmethod
+
+import numpy as np
+import matplotlib.pyplot as plt
+from scipy.integrate import cumulative_trapezoid
+
+# Pulse timing for arbitrary emitter and observer worldlines. Positions are arrays
+# of shape (n, dim) in the lab frame. Pulses are emitted at equal proper-time
+# intervals of the emitter, and arrival times come from a vectorized light-cone
+# solve (safeguarded Newton), so millions of pulses are timed in a few array passes.
+
+c = 1.0
+
+
+class Worldline(ABC):
+    """Base class: subclasses provide position(t), velocity(t) and lab_time(tau)."""
+
+    @abstractmethod
+    def position(self, t):
+        """Lab-frame positions at lab times t, shape (n, dim)."""
+
+    @abstractmethod
+    def velocity(self, t):
+        """Lab-frame velocities at lab times t, shape (n, dim)."""
+
+    @abstractmethod
+    def lab_time(self, tau):
+        """Lab time at which the emitter's clock reads tau."""
+
+
+class Stationary(Worldline):
+    def __init__(self, position):
+        self.x0 = np.asarray(position, dtype=float)
+
+    def position(self, t):
+        return np.broadcast_to(self.x0, (np.size(t), self.x0.size))
+
+    def velocity(self, t):
+        return np.zeros((np.size(t), self.x0.size))
+
+    def lab_time(self, tau):
+        return np.asarray(tau, dtype=float)
+
+
+class StraightLine(Worldline):
+    """Uniform motion x(t) = x0 + v t (the doppler.py / transverse.py emitters)."""
+
+    def __init__(self, x0, v):
+        self.x0 = np.asarray(x0, dtype=float)
+        self.v = np.asarray(v, dtype=float)
+        self.gamma = 1 / np.sqrt(1 - np.sum(self.v**2) / c**2)
+
+    def position(self, t):
+        return self.x0 + np.outer(t, self.v)
+
+    def velocity(self, t):
+        return np.broadcast_to(self.v, (np.size(t), self.v.size))
+
+    def lab_time(self, tau):
+        return self.gamma * np.asarray(tau, dtype=float)
+
+
+class CircularOrbit(Worldline):
+    """Circular orbit of the given radius and angular velocity around center (2D)."""
+
+    def __init__(self, radius, omega, center=(0.0, 0.0), phase=0.0):
+        self.radius = radius
+        self.omega = omega
+        self.center = np.asarray(center, dtype=float)
+        self.phase = phase
+        self.gamma = 1 / np.sqrt(1 - (radius * omega / c)**2)
+
+    def position(self, t):
+        angle = self.omega * np.asarray(t) + self.phase
+        return self.center + self.radius * np.column_stack([np.cos(angle), np.sin(angle)])
+
+    def velocity(self, t):
+        angle = self.omega * np.asarray(t) + self.phase
+        return self.radius * self.omega * np.column_stack([-np.sin(angle), np.cos(angle)])
+
+    def lab_time(self, tau):
+        return self.gamma * np.asarray(tau, dtype=float)
+
+
+class HyperbolicMotion(Worldline):
+    """Constant proper acceleration g along direction, starting at rest from x0 at t = 0."""
+
+    def __init__(self, g, x0=(0.0, 0.0), direction=(1.0, 0.0)):
+        self.g = g
+        self.x0 = np.asarray(x0, dtype=float)
+        self.direction = np.asarray(direction, dtype=float) / np.linalg.norm(direction)
+
+    def position(self, t):
+        s = c**2 / self.g * (np.sqrt(1 + (self.g * np.asarray(t) / c)**2) - 1)
+        return self.x0 + np.outer(s, self.direction)
+
+    def velocity(self, t):
+        gt = self.g * np.asarray(t)
+        speed = gt / np.sqrt(1 + (gt / c)**2)
+        return np.outer(speed, self.direction)
+
+    def lab_time(self, tau):
+        return c / self.g * np.sinh(self.g * np.asarray(tau, dtype=float) / c)
+
+
+class SampledTrajectory(Worldline):
+    """Trajectory given as lab-time samples, linearly interpolated between them.
+
+    Proper time is integrated from the sampled speeds; outside the sampled range the
+    emitter is held at its end points, but lab_time only accepts proper times the
+    samples cover.
+    """
+
+    def __init__(self, t_samples, positions):
+        self.t_samples = np.asarray(t_samples, dtype=float)
+        self.positions = np.asarray(positions, dtype=float)
+        self.velocities = np.gradient(self.positions, self.t_samples, axis=0)
+        speed2 = np.sum(self.velocities**2, axis=1) / c**2
+        if np.any(speed2 >= 1):
+            raise ValueError("Sampled trajectory reaches or exceeds the speed of light")
+        self.tau_samples = cumulative_trapezoid(np.sqrt(1 - speed2), self.t_samples, initial=0.0)
+
+    def _interp(self, t, values):
+        t = np.asarray(t, dtype=float)
+        return np.column_stack([np.interp(t, self.t_samples, values[:, k]) for k in range(values.shape[1])])
+
+    def position(self, t):
+        return self._interp(t, self.positions)
+
+    def velocity(self, t):
+        return self._interp(t, self.velocities)
+
+    def lab_time(self, tau):
+        tau = np.asarray(tau, dtype=float)
+        if np.any((tau < 0) | (tau > self.tau_samples[-1])):
+            raise ValueError(f"Proper times must lie in [0, {self.tau_samples[-1]:.6g}] "
+                             f"covered by the sampled trajectory")
+        return np.interp(tau, self.tau_samples, self.t_samples)
+
+
+def _solve_increasing(f, fprime, lo, hi, x0, tol=1e-12, max_iter=100):
+    """Vectorized root of increasing f on [lo, hi] (f(lo) <= 0 <= f(hi)).
+
+    Newton steps that leave the bracket fall back to bisection.
+    """
+    x = np.clip(x0, lo, hi)
+    for _ in range(max_iter):
+        fx = f(x)
+        lo = np.where(fx <= 0, x, lo)
+        hi = np.where(fx >= 0, x, hi)
+        step = fx / fprime(x)
+        x_new = x - step
+        outside = (x_new < lo) | (x_new > hi) | ~np.isfinite(x_new)
+        x_new = np.where(outside, 0.5 * (lo + hi), x_new)
+        converged = np.abs(x_new - x) <= tol * np.maximum(1.0, np.abs(x))
+        x = x_new
+        if np.all(converged):
+            break
+    return x
+
+
+def _expand_bracket(f, lo, hi, grow):
+    """Push hi (grow > 0) or lo (grow < 0) outwards until the root is bracketed."""
+    step = np.full_like(hi if grow > 0 else lo, abs(grow))
+    for _ in range(200):
+        edge = hi if grow > 0 else lo
+        values = f(edge)
+        bad = values < 0 if grow > 0 else values > 0
+        if not np.any(bad):
+            break
+        if grow > 0:
+            hi = np.where(bad, hi + step, hi)
+        else:
+            lo = np.where(bad, lo - step, lo)
+        step = np.where(bad, 2 * step, step)
+    return lo, hi
+
+
+def arrival_times(emitter, t_emit, observer):
+    """Lab times at which pulses emitted at t_emit reach the observer worldline.
+
+    Solves t_a - t_e = |r_obs(t_a) - r_emit(t_e)| / c for every pulse at once.
+    """
+    t_emit = np.asarray(t_emit, dtype=float)
+    if t_emit.size == 0:
+        return np.empty(0)
+    r_e = emitter.position(t_emit)
+
+    def separation(t_a):
+        delta = observer.position(t_a) - r_e
+        return delta, np.sqrt(np.sum(delta**2, axis=1))
+
+    def f(t_a):
+        return t_a - t_emit - separation(t_a)[1] / c
+
+    def fprime(t_a):
+        delta, dist = separation(t_a)
+        radial = np.sum(delta * observer.velocity(t_a), axis=1) / np.maximum(dist, 1e-300)
+        return 1 - radial / c
+
+    guess = t_emit + separation(t_emit)[1] / c
+    lo, hi = _expand_bracket(f, t_emit.copy(), guess.copy(), grow=np.max(guess - t_emit) + 1.0)
+    return _solve_increasing(f, fprime, lo, hi, guess)
+
+
+def retarded_times(emitter, t_obs, observer):
+    """Emission times whose light reaches the observer at t_obs (the retarded times)."""
+    t_obs = np.asarray(t_obs, dtype=float)
+    if t_obs.size == 0:
+        return np.empty(0)
+    r_o = observer.position(t_obs)
+
+    def separation(t_e):
+        delta = r_o - emitter.position(t_e)
+        return delta, np.sqrt(np.sum(delta**2, axis=1))
+
+    # h(t_e) = t_e + |r_o - r_e(t_e)| / c - t_obs increases with t_e for a subluminal emitter
+    def h(t_e):
+        return t_e + separation(t_e)[1] / c - t_obs
+
+    def hprime(t_e):
+        delta, dist = separation(t_e)
+        radial = np.sum(delta * emitter.velocity(t_e), axis=1) / np.maximum(dist, 1e-300)
+        return 1 - radial / c
+
+    guess = t_obs - separation(t_obs)[1] / c
+    lo, hi = _expand_bracket(h, guess.copy(), t_obs.copy(), grow=-(np.max(t_obs - guess) + 1.0))
+    return _solve_increasing(h, hprime, lo, hi, guess)
+
+
+def pulse_arrivals(emitter, observer, T_emit, num_pulses, tau_start=0.0):
+    """Emit num_pulses at proper-time spacing T_emit; return (t_emit, t_arrival)."""
+    tau = tau_start + np.arange(num_pulses) * T_emit
+    t_emit = emitter.lab_time(tau)
+    return t_emit, arrival_times(emitter, t_emit, observer)
+
+
+def plot_intervals(arrival_intervals, expected_interval, title, expected_label="Expected Interval"):
+    """Interval-vs-expected plot in the style of transverse.py and doppler.py."""
+    plt.figure(figsize=(10, 6))
+    plt.plot(arrival_intervals, label="Simulated Arrival Intervals", color="blue")
+    plt.axhline(expected_interval, color="green", linestyle="--",
+                label=f"{expected_label} = {expected_interval:.3f}")
+    plt.title(title)
+    plt.xlabel("Pulse Index")
+    plt.ylabel("Interval Between Arrivals")
+    plt.legend()
+    plt.grid(True)
+    plt.show()
+
+
+if __name__ == "__main__":
+    # --- Parameters (transverse.py units) ---
+    T_emit = 1.0
+    v = 0.6 * c
+    num_pulses = 1_000_000
+    observer = Stationary((0.0, 0.0))
+
+    # Circular orbit around the observer: distance really is constant, so every
+    # interval is the pure transverse Doppler value γ T_emit
+    radius = 50.0
+    orbit = CircularOrbit(radius, v / radius)
+    _, t_arrival = pulse_arrivals(orbit, observer, T_emit, num_pulses)
+    intervals = np.diff(t_arrival)
+    plot_intervals(intervals[:500], orbit.gamma * T_emit, "Transverse Doppler Effect (Circular Orbit)",
+                   expected_label="Expected Transverse Interval")
+    print(f"Orbit: γ = {orbit.gamma:.5f}, mean interval = {np.mean(intervals):.5f}, "
+          f"max deviation = {np.max(np.abs(intervals - orbit.gamma * T_emit)):.2e}")
+
+    # transverse.py's emitter with the actual geometry: x = v t at y = 50
+    line = StraightLine((-v * 100.0, 50.0), (v, 0.0))
+    _, t_arrival = pulse_arrivals(line, observer, T_emit, 200)
+    plot_intervals(np.diff(t_arrival), line.gamma * T_emit, "Straight-Line Pass at y = 50 (Actual Geometry)",
+                   expected_label="Expected Transverse Interval")
+
+    # Uniformly accelerating source receding from the observer
+    accelerating = HyperbolicMotion(g=0.05, x0=(10.0, 0.0))
+    tau_emit = np.arange(200) * T_emit
+    _, t_arrival = pulse_arrivals(accelerating, observer, T_emit, 200)
+    # Receding radially: t_arrival = x0 / c + (c / g)(exp(g τ / c) - 1)
+    expected = c / accelerating.g * np.diff(np.exp(accelerating.g * tau_emit / c))
+    plt.figure(figsize=(10, 6))
+    plt.plot(np.diff(t_arrival), label="Simulated Arrival Intervals", color="blue")
+    plt.plot(expected, color="green", linestyle="--", label="Expected Interval (hyperbolic motion)")
+    plt.title("Pulse Timing from a Uniformly Accelerating Source")
+    plt.xlabel("Pulse Index")
+    plt.ylabel("Interval Between Arrivals")
+    plt.yscale("log")
+    plt.legend()
+    plt.grid(True)
+    plt.show()
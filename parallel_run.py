@@ -0,0 +1,223 @@
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import fast_kernels
+from detector_noise import DarkCounts, NoisePipeline
+
+# One large DoubleSlit.py / pulse_no_dead_time.py run split across processes.
+# The pulse budget is cut into consecutive time segments, one per worker, each
+# with its own random stream. A worker accumulates into its own row of a shared
+# (n_workers × num_bins) histogram, so no event arrays are pickled.
+#
+# Dead time couples segments only through the first few candidates of each
+# segment: once a candidate is far enough from everything before it (a "sync"
+# candidate), the rest of the segment is independent of earlier segments. Each
+# worker therefore returns only its head (the candidates before sync), and the
+# parent stitches heads in time order with the exact dead-time state. A segment
+# whose head cannot be resolved that way is recomputed serially from its seed.
+
+DOUBLE_SLIT_DEFAULTS = dict(pulse_rate=10_000, quantum_efficiency=0.7, detector_dead_time=100e-9,
+                            dark_rate=10, jitter_std=0.5e-9, a=5e-6, lambda_eff=800e-9, d=20e-6,
+                            L=1.0, screen_width=0.04, num_bins=600)
+PULSE_SLIT_DEFAULTS = dict(L=1.0, screen_width=0.01, num_bins=1000, slit_sep=1e-3, slit_width=10e-6,
+                           angular_spread=1e-3, position_spread=0.5e-3, pulse_rate=1_000_000,
+                           dark_time=10e-6)
+
+
+def _double_slit_candidates(n_pulses, params, rng):
+    """Segment-relative times, stored-time offsets and bins for every pulse of DoubleSlit.py."""
+    times = np.cumsum(rng.exponential(1 / params["pulse_rate"], n_pulses))
+    offsets = rng.normal(0, params["jitter_std"], n_pulses)
+    bins = fast_kernels.sample_bins(params["probabilities"], rng.random(n_pulses))
+    return times, times[-1], offsets, bins
+
+
+def _pulse_slit_candidates(n_pulses, params, rng):
+    """Segment-relative times and bins of the slit-passing pulses of pulse_no_dead_time.py."""
+    times = np.cumsum(rng.exponential(1 / params["pulse_rate"], n_pulses))
+    x_hit, through_slit = fast_kernels.slit_hits(n_pulses, params["L"], params["slit_sep"],
+                                                 params["slit_width"], params["angular_spread"],
+                                                 params["position_spread"], rng)
+    bins = fast_kernels.nearest_bin(params["bin_positions"], x_hit[through_slit])
+    return times[through_slit], times[-1], None, bins
+
+
+KINDS = {
+    "double_slit": (_double_slit_candidates, "detector_dead_time", DOUBLE_SLIT_DEFAULTS),
+    "pulse_slit": (_pulse_slit_candidates, "dark_time", PULSE_SLIT_DEFAULTS),
+}
+
+
+def _prepare(kind, params):
+    params = {**KINDS[kind][2], **params}
+    positions = np.linspace(-params["screen_width"] / 2, params["screen_width"] / 2, params["num_bins"])
+    if kind == "double_slit":
+        params["probabilities"] = fast_kernels.double_slit_probabilities(
+            positions, params["quantum_efficiency"], params["a"], params["lambda_eff"], params["d"], params["L"])
+        # Bound on how far a stored (jittered) time can run past the segment boundary
+        params.setdefault("margin", 8 * params["jitter_std"])
+    else:
+        params["bin_positions"] = positions
+        params.setdefault("margin", 0.0)
+    return params, positions
+
+
+def _split(seed, num_pulses, n_workers):
+    """One seed per segment plus one for the noise stages, and each segment's pulse budget."""
+    seeds = np.random.SeedSequence(seed).spawn(n_workers + 1)
+    budgets = [len(part) for part in np.array_split(np.arange(num_pulses), n_workers)]
+    return seeds, budgets
+
+
+def _sync_index(times, release, dead_time, margin):
+    """First candidate accepted whatever happened before the segment (prior stored time <= margin)."""
+    prior = np.empty(times.size)
+    prior[0] = margin
+    prior[1:] = np.maximum(np.maximum.accumulate(release)[:-1], margin)
+    free = np.flatnonzero(times - prior >= dead_time)
+    return free[0] if free.size else None
+
+
+def simulate_segment(kind, params, seed, n_pulses, hist_row, chunk_size, last_detection_time=None):
+    """Simulate one time segment into hist_row.
+
+    With a known segment-relative last_detection_time the whole segment is resolved
+    exactly. With last_detection_time=None the head before the first sync candidate
+    is left out of hist_row and returned for stitching.
+    Returns dict(head=(times, offsets, bins) or None, duration, last_release, synced).
+    """
+    candidates, dead_key, _ = KINDS[kind]
+    dead_time = params[dead_key]
+    rng = np.random.default_rng(seed)
+    t_offset = 0.0
+    last = -np.inf if last_detection_time is None else last_detection_time
+    head = None
+    synced = last_detection_time is not None
+
+    for start in range(0, n_pulses, chunk_size):
+        n_chunk = min(chunk_size, n_pulses - start)
+        times, duration, offsets, bins = candidates(n_chunk, params, rng)
+        times = times + t_offset
+        release = times if offsets is None else times + offsets
+
+        if not synced:
+            sync = _sync_index(times, release, dead_time, params["margin"]) if times.size else None
+            if sync is None:
+                # No sync candidate in the first chunk: let the parent redo this segment serially
+                return dict(head=None, duration=None, last_release=None, synced=False)
+            head = (times[:sync], None if offsets is None else offsets[:sync], bins[:sync])
+            times, release, bins = times[sync:], release[sync:], bins[sync:]
+            synced = True
+
+        accepted = fast_kernels.dead_time_filter(times, dead_time, offsets=release - times,
+                                                 last_detection_time=last)
+        hist_row += np.bincount(bins[accepted], minlength=hist_row.size)
+        if np.any(accepted):
+            last = release[accepted][-1]
+        t_offset += duration
+
+    # An empty segment never reaches a sync candidate; the parent then resolves it
+    # from the known state, which just carries that state through
+    return dict(head=head, duration=t_offset, last_release=last, synced=synced)
+
+
+def _worker(task):
+    kind, params, seed, n_pulses, shm_name, shape, row, chunk_size = task
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        hist = np.ndarray(shape, dtype=np.int64, buffer=shm.buf)
+        return simulate_segment(kind, params, seed, n_pulses, hist[row], chunk_size)
+    finally:
+        shm.close()
+
+
+def parallel_run(kind="double_slit", num_pulses=10_000_000, n_workers=4, seed=None,
+                 chunk_size=2_000_000, noise=None, **params):
+    """Run one simulation of num_pulses pulses split over n_workers processes.
+
+    kind is "double_slit" (DoubleSlit.py) or "pulse_slit" (pulse_no_dead_time.py);
+    params override the defaults of that script. Returns (positions, detections).
+    """
+    params, positions = _prepare(kind, params)
+    dead_time = params[KINDS[kind][1]]
+    seeds, budgets = _split(seed, num_pulses, n_workers)
+
+    shape = (n_workers, params["num_bins"])
+    shm = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)) * 8)
+    try:
+        hist = np.ndarray(shape, dtype=np.int64, buffer=shm.buf)
+        hist[:] = 0
+        tasks = [(kind, params, seeds[k], budgets[k], shm.name, shape, k, chunk_size)
+                 for k in range(n_workers)]
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            segments = list(pool.map(_worker, tasks))
+
+        # --- Stitch segment heads in time order ---
+        last_rel = -np.inf  # previous stored detection time, relative to this segment's start
+        total_time = 0.0
+        for k, segment in enumerate(segments):
+            if not segment["synced"] or last_rel > params["margin"]:
+                hist[k] = 0
+                segment = simulate_segment(kind, params, seeds[k], budgets[k], hist[k], chunk_size,
+                                           last_detection_time=last_rel)
+                last = segment["last_release"]
+            else:
+                head_times, head_offsets, head_bins = segment["head"]
+                accepted = fast_kernels.dead_time_filter(head_times, dead_time, offsets=head_offsets,
+                                                         last_detection_time=last_rel)
+                hist[k] += np.bincount(head_bins[accepted], minlength=shape[1])
+                # The sync candidate is always accepted, so the tail's last detection is final
+                last = segment["last_release"]
+            last_rel = last - segment["duration"]
+            total_time += segment["duration"]
+
+        detections = hist.sum(axis=0)
+    finally:
+        shm.close()
+        shm.unlink()
+
+    if kind == "double_slit":
+        if noise is None:
+            noise = NoisePipeline([DarkCounts(params["dark_rate"], params["num_bins"])])
+        detections = noise.histogram(detections.astype(float), (0.0, total_time),
+                                     np.random.default_rng(seeds[-1]))
+    return positions, detections
+
+
+def serial_run(kind="double_slit", num_pulses=10_000_000, n_workers=4, seed=None, chunk_size=2_000_000, **params):
+    """Same segments and seeds as parallel_run, resolved one after another (noise-free)."""
+    params, positions = _prepare(kind, params)
+    seeds, budgets = _split(seed, num_pulses, n_workers)
+    detections = np.zeros(params["num_bins"], dtype=np.int64)
+    last_rel = -np.inf
+    for k in range(n_workers):
+        segment = simulate_segment(kind, params, seeds[k], budgets[k], detections, chunk_size,
+                                   last_detection_time=last_rel)
+        last_rel = segment["last_release"] - segment["duration"]
+    return positions, detections
+
+
+if __name__ == "__main__":
+    import time
+    import matplotlib.pyplot as plt
+
+    # --- Parameters ---
+    num_pulses = 50_000_000
+    n_workers = 4
+
+    start = time.perf_counter()
+    y_screen, detections = parallel_run("double_slit", num_pulses=num_pulses, n_workers=n_workers, seed=1)
+    elapsed = time.perf_counter() - start
+
+    plt.figure(figsize=(10, 5))
+    plt.bar(y_screen, detections, width=y_screen[1] - y_screen[0], color='royalblue', alpha=0.85)
+    plt.title(f"Parallel Double-Slit Run ({num_pulses:,} pulses on {n_workers} workers)")
+    plt.xlabel("Screen Position (m)")
+    plt.ylabel("Photon Counts")
+    plt.grid(True)
+    plt.tight_layout()
+    plt.show()
+
+    print(f"Total detections: {np.sum(detections):.0f}")
+    print(f"Wall time: {elapsed:.2f} s ({num_pulses / elapsed:.3g} pulses/s)")
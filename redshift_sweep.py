@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+from functools import lru_cache
+from itertools import product
+from concurrent.futures import ProcessPoolExecutor
+from scipy.integrate import cumulative_trapezoid
+
+# Constants (same units as redshift.py)
+c = 1.0
+T_emit = 1.0
+num_pulses = 100
+
+# Distance-table grid shared by every model
+t_grid_min = 0.5
+t_grid_max = 1e4  # same cap as find_arrival_time in redshift.py
+grid_points = 200_000
+
+# Scale-factor laws, looked up by name so tasks stay picklable
+SCALE_FACTORS = {
+    "power": lambda t, p: t**p,                   # p = 2/3 matter, 1/2 radiation
+    "de_sitter": lambda t, H: np.exp(H * (t - 1.0)),
+}
+
+
+def a(law, param, t):
+    return SCALE_FACTORS[law](t, param)
+
+
+# Tasks arrive grouped by model, so a few recent tables give all the reuse; each
+# table is two grid_points float64 arrays (~3 MB), so the cache is kept small
+@lru_cache(maxsize=8)
+def distance_table(law, param):
+    """Cumulative comoving distance ∫ c / a(t) dt on the shared time grid (cached per worker)."""
+    t_grid = np.geomspace(t_grid_min, t_grid_max, grid_points)
+    with np.errstate(over="ignore"):  # exponential laws overflow to a = inf, i.e. c / a = 0
+        chi = cumulative_trapezoid(c / a(law, param, t_grid), t_grid, initial=0.0)
+    return t_grid, chi
+
+
+def arrival_times(law, param, t_emit, x_target):
+    """Invert the cached distance table: arrival time when light has covered x_target."""
+    t_grid, chi = distance_table(law, param)
+    t_emit = np.asarray(t_emit, dtype=float)
+    if np.any((t_emit < t_grid[0]) | (t_emit > t_grid[-1])):
+        raise ValueError(f"Emission epochs must lie in [{t_grid_min}, {t_grid_max}] "
+                         f"covered by the distance table")
+    chi_target = np.interp(t_emit, t_grid, chi) + x_target
+    t_arrival = np.interp(chi_target, chi, t_grid)
+    # Targets beyond the horizon (or past the grid cap) never receive the pulse
+    t_arrival[chi_target > chi[-1]] = np.nan
+    return t_arrival
+
+
+def run_model(task):
+    law, param, x_comoving, t_start = task
+    t_emit_vals = np.arange(num_pulses) * T_emit + t_start
+    t_arrivals = arrival_times(law, param, t_emit_vals, x_comoving)
+
+    pulse_redshifts = np.diff(t_arrivals) / T_emit - 1
+    mean_z = np.mean(pulse_redshifts)
+    with np.errstate(over="ignore"):
+        z_theoretical = a(law, param, t_arrivals[-1]) / a(law, param, t_emit_vals[-1]) - 1
+
+    return {
+        "law": law,
+        "param": param,
+        "x_comoving": x_comoving,
+        "t_emit_start": t_start,
+        "mean_z": mean_z,
+        "z_theoretical": z_theoretical,
+    }
+
+
+def run_chunk(tasks):
+    return [run_model(task) for task in tasks]
+
+
+def sweep(models, distances, emission_epochs, max_workers=None, chunk_size=256):
+    """Evaluate every (model, distance, epoch) combination across worker processes."""
+    # Group by model so each worker builds a given distance table as few times as possible
+    tasks = [(law, param, x, t0) for (law, param), x, t0 in product(models, distances, emission_epochs)]
+    chunks = [tasks[i:i + chunk_size] for i in range(0, len(tasks), chunk_size)]
+
+    results = []
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        for chunk_results in pool.map(run_chunk, chunks):
+            results.extend(chunk_results)
+    return pd.DataFrame(results)
+
+
+if __name__ == "__main__":
+    # --- Sweep Ranges ---
+    models = [
+        ("power", 2 / 3),    # matter-dominated (redshift.py)
+        ("power", 1 / 2),    # radiation-dominated
+        ("power", 0.8),
+        ("de_sitter", 0.05),
+        ("de_sitter", 0.02),
+    ]
+    distances = np.linspace(0.1, 5.0, 50)
+    emission_epochs = [1.0, 2.0, 5.0, 10.0, 50.0]
+
+    results_df = sweep(models, distances, emission_epochs)
+    results_df.to_csv("redshift_sweep.csv", index=False)
+
+    summary = results_df.assign(z_error=results_df["mean_z"] - results_df["z_theoretical"])
+    print(summary.groupby(["law", "param"])[["mean_z", "z_theoretical", "z_error"]].mean())
+    print(f"Sweep complete: {len(results_df)} combinations saved to redshift_sweep.csv")
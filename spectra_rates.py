@@ -0,0 +1,157 @@
+import numpy as np
+import matplotlib.pyplot as plt
+from scipy.sparse import coo_matrix
+from scipy.sparse.linalg import spsolve, expm_multiply
+
+# Rate-equation version of spectra.py: instead of sampling random transitions,
+# build the Δℓ = ±1 transition network as a sparse rate matrix and solve for the
+# level populations and line intensities directly. Emission (n → n - 1) and
+# excitation (m → m + 1) both run along the allowed edges only.
+
+# Constants
+h = 6.62607015e-34  # Planck (J·s)
+c = 299792458       # speed of light (m/s)
+eV = 1.60218e-19    # 1 eV in J
+E_ionization = 13.6  # eV
+
+
+def level_energy(n):
+    return -E_ionization / np.asarray(n, dtype=float)**2
+
+
+def orbital_l(n):
+    """Forge level n carries ℓ = n - 1, as in spectra.py's selection rule."""
+    return np.asarray(n) - 1
+
+
+def allowed_transitions(n_max):
+    """All (upper, lower) pairs with Δℓ = ±1, built without enumerating every level pair.
+
+    With ℓ = n - 1 the only lower level reachable from n is n - 1, so the network
+    has n_max - 1 edges.
+    """
+    upper = np.arange(2, n_max + 1)
+    lower = upper - 1
+    return upper, lower
+
+
+def emission_rates(upper, lower, A0=1.0):
+    """Spontaneous emission rates A ∝ ω³ |d|², normalized so the 2 → 1 line has rate A0.
+
+    For ℓ = n - 1 (circular) levels |d|² grows as lower⁴, giving the familiar A ∝ n⁻⁵.
+    """
+    delta_E = level_energy(upper) - level_energy(lower)
+    delta_E_ref = level_energy(2) - level_energy(1)
+    return A0 * (delta_E / delta_E_ref)**3 * np.asarray(lower, dtype=float)**4
+
+
+def rate_matrix(n_max, A0=1.0, excitation_rates=None):
+    """Sparse generator M with dp/dt = M p over levels 1..n_max (index n - 1).
+
+    excitation_rates[k] is the upward (absorption) rate on the k-th allowed edge,
+    lower → upper as returned by allowed_transitions, so excitation obeys the same
+    Δℓ = ±1 rule as emission. Storage is O(number of allowed transitions).
+    """
+    upper, lower = allowed_transitions(n_max)
+    src = [upper - 1]
+    dst = [lower - 1]
+    rates = [emission_rates(upper, lower, A0)]
+
+    if excitation_rates is not None:
+        src.append(lower - 1)
+        dst.append(upper - 1)
+        rates.append(np.broadcast_to(np.asarray(excitation_rates, dtype=float), upper.shape))
+
+    src, dst, rates = np.concatenate(src), np.concatenate(dst), np.concatenate(rates)
+    # Gain into the destination level, loss from the source level
+    rows = np.concatenate([dst, src])
+    cols = np.concatenate([src, src])
+    data = np.concatenate([rates, -rates])
+    return coo_matrix((data, (rows, cols)), shape=(n_max, n_max)).tocsc()
+
+
+def steady_state(M):
+    """Solve M p = 0 with Σp = 1.
+
+    Fixing the ground population to 1 leaves the sparse system M[1:, 1:] p[1:] = -M[1:, 0],
+    which keeps the sparsity of M; the result is then normalized.
+    """
+    M = M.tocsc()
+    p = np.empty(M.shape[0])
+    p[0] = 1.0
+    p[1:] = spsolve(M[1:, 1:], -M[1:, 0].toarray().ravel())
+    return p / np.sum(p)
+
+
+def populations_vs_time(M, p0, t_stop, num_times=100):
+    """Populations p(t) on num_times points in [0, t_stop], via expm_multiply."""
+    times = np.linspace(0, t_stop, num_times)
+    populations = expm_multiply(M, p0, start=0, stop=t_stop, num=num_times, endpoint=True)
+    return times, populations
+
+
+def emission_lines(populations, n_max, A0=1.0):
+    """Line energies (eV) and emitted intensities A_nm p_n (photons per unit time)."""
+    upper, lower = allowed_transitions(n_max)
+    energies = level_energy(upper) - level_energy(lower)
+    intensities = emission_rates(upper, lower, A0) * populations[upper - 1]
+    return upper, lower, energies, intensities
+
+
+def absorption_lines(populations, n_max):
+    """Line energies (eV) and absorption strengths, proportional to the lower-level population.
+
+    These are the lower → upper edges that rate_matrix's excitation_rates act on.
+    """
+    upper, lower = allowed_transitions(n_max)
+    energies = level_energy(upper) - level_energy(lower)
+    return upper, lower, energies, populations[lower - 1]
+
+
+def energy_to_wavelength_nm(energy_ev):
+    """Convert energy in eV to wavelength in nm"""
+    return (h * c / (energy_ev * eV)) * 1e9
+
+
+if __name__ == "__main__":
+    # --- Parameters ---
+    n_max = 2000
+    A0 = 1.0                   # 2 → 1 emission rate
+    excitation_ratio = 0.99    # m → m + 1 excitation rate relative to the m + 1 → m emission rate
+
+    upper, lower = allowed_transitions(n_max)
+    excitation_rates = excitation_ratio * emission_rates(upper, lower, A0)
+    M = rate_matrix(n_max, A0=A0, excitation_rates=excitation_rates)
+
+    # Steady state
+    p_ss = steady_state(M)
+    upper, lower, energies, intensities = emission_lines(p_ss, n_max, A0=A0)
+
+    # Time-dependent cascade from a single excited level, no excitation
+    n_start = 5
+    p0 = np.zeros(n_max)
+    p0[n_start - 1] = 1.0
+    times, p_t = populations_vs_time(rate_matrix(n_max, A0=A0), p0, t_stop=2000.0)
+
+    fig, axs = plt.subplots(2, 1, figsize=(10, 9))
+    axs[0].hist(energies, bins=150, weights=intensities, color="black", alpha=0.85)
+    axs[0].set_yscale("log")
+    axs[0].set_title(f"Steady-State Forge Emission Spectrum (rate equations, n_max = {n_max})")
+    axs[0].set_xlabel("Transition Energy (eV)")
+    axs[0].set_ylabel("Intensity (photons / unit time)")
+    axs[0].grid(True)
+
+    for n in range(1, n_start + 1):
+        axs[1].plot(times, p_t[:, n - 1], label=f"n = {n}")
+    axs[1].set_title(f"Cascade Populations from n = {n_start}")
+    axs[1].set_xlabel("Time (1 / A0)")
+    axs[1].set_ylabel("Population")
+    axs[1].grid(True)
+    axs[1].legend(fontsize=8, ncol=2)
+    plt.tight_layout()
+    plt.show()
+
+    strongest = np.argsort(intensities)[::-1][:5]
+    for k in strongest:
+        print(f"{upper[k]} → {lower[k]}: {energies[k]:.4f} eV "
+              f"({energy_to_wavelength_nm(energies[k]):.1f} nm), intensity {intensities[k]:.3e}")
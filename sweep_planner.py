@@ -0,0 +1,189 @@
+import numpy as np
+import pandas as pd
+from scipy.linalg import cho_factor, cho_solve
+from scipy.optimize import minimize
+from scipy.stats import qmc
+
+import fast_kernels
+from time_resolved import fringe_visibility
+
+# Space-filling alternative to the itertools.product grid in ds_sweep.py: sample the
+# parameter box with a Sobol or Latin hypercube design, fit a Gaussian-process
+# surrogate to the visibilities, then spend the remaining simulations where the
+# surrogate is least certain.
+
+# --- Simulation Parameters (ds_sweep.py) ---
+num_pulses = 500_000
+L = 1.0
+screen_width = 0.01
+num_bins = 1000
+position_spread = 0.5e-3
+slit_width = 10e-6
+
+# --- Continuous parameter ranges: (name, low, high, column scale, column name) ---
+PARAMETERS = [
+    ("angular_spread", 0.0005, 0.002, 1e3, "angular_spread_mrad"),
+    ("slit_sep", 0.5e-3, 2e-3, 1e3, "slit_separation_mm"),
+    ("dark_time", 0.0, 20e-6, 1e6, "dark_time_us"),
+    ("pulse_rate", 2e5, 2e6, 1e-3, "pulse_rate_khz"),
+]
+
+
+def design(n_points, method="sobol", seed=None):
+    """Quasi-random design of n_points in the unit cube (one column per parameter).
+
+    Sobol designs keep their balance properties only for powers of two, so other
+    sizes are rejected; use method="lhs" for an arbitrary number of points.
+    """
+    if method == "sobol":
+        m = int(np.log2(n_points)) if n_points > 0 else -1
+        if m < 0 or 2**m != n_points:
+            raise ValueError(f"Sobol designs need a power-of-two size, got {n_points}")
+        return qmc.Sobol(d=len(PARAMETERS), scramble=True, seed=seed).random_base2(m)
+    if method == "lhs":
+        return qmc.LatinHypercube(d=len(PARAMETERS), seed=seed).random(n_points)
+    raise ValueError(f"Unknown design method: {method}")
+
+
+def to_physical(unit_points):
+    lows = np.array([p[1] for p in PARAMETERS])
+    highs = np.array([p[2] for p in PARAMETERS])
+    return qmc.scale(np.atleast_2d(unit_points), lows, highs)
+
+
+def simulate_visibility(angular_spread, slit_sep, dark_time, pulse_rate, rng=np.random):
+    """One ds_sweep.py point, run through the vectorized pulse kernel."""
+    bin_positions, detections = fast_kernels.pulse_slit(
+        num_pulses=num_pulses, L=L, screen_width=screen_width, num_bins=num_bins,
+        slit_sep=slit_sep, slit_width=slit_width, angular_spread=angular_spread,
+        position_spread=position_spread, pulse_rate=pulse_rate, dark_time=dark_time, rng=rng)
+    return fringe_visibility(detections, bin_positions)
+
+
+class GaussianProcess:
+    """Zero-mean GP with an anisotropic RBF kernel on unit-cube inputs.
+
+    Length scales and noise are fit by maximizing the log marginal likelihood;
+    targets are standardized internally. The fitted noise (in standardized units)
+    is kept above noise_min, since every target is a Monte Carlo estimate and an
+    interpolating fit would chase that noise. Predicted means are clipped to the
+    [0, 1] range a visibility can take.
+    """
+
+    def __init__(self, length_scales=None, noise=1e-2, noise_min=1e-3):
+        self.length_scales = length_scales
+        self.noise = noise
+        self.noise_min = noise_min
+
+    def _kernel(self, A, B, length_scales):
+        diff = (A[:, None, :] - B[None, :, :]) / length_scales
+        return np.exp(-0.5 * np.sum(diff**2, axis=-1))
+
+    def kernel(self, A, B):
+        """Prior covariance between the rows of A and B under the fitted length scales."""
+        return self._kernel(np.asarray(A, dtype=float), np.asarray(B, dtype=float), self.length_scales)
+
+    def _neg_log_likelihood(self, log_params):
+        length_scales, noise = np.exp(log_params[:-1]), np.exp(log_params[-1])
+        K = self._kernel(self.X, self.X, length_scales) + (noise + 1e-8) * np.eye(len(self.X))
+        try:
+            factor = cho_factor(K, lower=True)
+        except np.linalg.LinAlgError:
+            return np.inf
+        alpha = cho_solve(factor, self.y)
+        return 0.5 * self.y @ alpha + np.sum(np.log(np.diag(factor[0])))
+
+    def fit(self, X, y):
+        self.X = np.asarray(X, dtype=float)
+        y = np.asarray(y, dtype=float)
+        self.y_mean, self.y_std = np.mean(y), np.std(y) or 1.0
+        self.y = (y - self.y_mean) / self.y_std
+
+        start = np.log(np.append(self.length_scales if self.length_scales is not None
+                                 else np.full(self.X.shape[1], 0.3), max(self.noise, self.noise_min)))
+        bounds = [(np.log(1e-2), np.log(10.0))] * self.X.shape[1] + [(np.log(self.noise_min), np.log(1.0))]
+        best = minimize(self._neg_log_likelihood, start, method="L-BFGS-B", bounds=bounds)
+        self.length_scales, self.noise = np.exp(best.x[:-1]), np.exp(best.x[-1])
+
+        K = self.kernel(self.X, self.X) + (self.noise + 1e-8) * np.eye(len(self.X))
+        self._factor = cho_factor(K, lower=True)
+        self._alpha = cho_solve(self._factor, self.y)
+        return self
+
+    def predict(self, X_new):
+        """Posterior mean and standard deviation of the latent visibility at X_new."""
+        K_s = self.kernel(X_new, self.X)
+        mean = np.clip(self.y_mean + self.y_std * (K_s @ self._alpha), 0.0, 1.0)
+        v = cho_solve(self._factor, K_s.T)
+        var = np.maximum(1.0 - np.sum(K_s * v.T, axis=1), 0.0)
+        return mean, self.y_std * np.sqrt(var)
+
+
+def most_uncertain(gp, batch_size, n_candidates=4096, seed=None):
+    """Greedy batch of candidates with the highest posterior std.
+
+    After each pick the point is added as a pseudo-observation (the GP variance does
+    not depend on the observed value), so one batch does not cluster on a single spot.
+    """
+    candidates = design(n_candidates, method="sobol", seed=seed)
+    X = gp.X
+    picks = []
+    for _ in range(batch_size):
+        K = gp.kernel(X, X) + (gp.noise + 1e-8) * np.eye(len(X))
+        factor = cho_factor(K, lower=True)
+        K_s = gp.kernel(candidates, X)
+        var = 1.0 - np.sum(K_s * cho_solve(factor, K_s.T).T, axis=1)
+        best = int(np.argmax(var))
+        picks.append(candidates[best])
+        X = np.vstack([X, candidates[best]])
+        candidates = np.delete(candidates, best, axis=0)
+    return np.array(picks)
+
+
+def evaluate(unit_points, stage, rng=np.random):
+    rows = []
+    for unit, physical in zip(unit_points, to_physical(unit_points)):
+        row = {column: value * scale for (_, _, _, scale, column), value in zip(PARAMETERS, physical)}
+        row["visibility"] = simulate_visibility(*physical, rng=rng)
+        row["stage"] = stage
+        row["unit"] = unit
+        rows.append(row)
+    return rows
+
+
+def adaptive_sweep(n_initial=64, n_adaptive=64, batch_size=8, method="sobol", seed=None):
+    """Initial space-filling design followed by uncertainty-driven batches.
+
+    Returns (results DataFrame, fitted GaussianProcess).
+    """
+    rng = np.random.default_rng(seed)
+    rows = evaluate(design(n_initial, method=method, seed=seed), "initial", rng=rng)
+
+    for batch in range(int(np.ceil(n_adaptive / batch_size))):
+        valid = [row for row in rows if np.isfinite(row["visibility"])]
+        gp = GaussianProcess().fit([row["unit"] for row in valid], [row["visibility"] for row in valid])
+        n_new = min(batch_size, n_adaptive - batch * batch_size)
+        rows += evaluate(most_uncertain(gp, n_new, seed=rng.integers(2**32)), "adaptive", rng=rng)
+
+    valid = [row for row in rows if np.isfinite(row["visibility"])]
+    gp = GaussianProcess().fit([row["unit"] for row in valid], [row["visibility"] for row in valid])
+    return pd.DataFrame(rows).drop(columns="unit"), gp
+
+
+if __name__ == "__main__":
+    results_df, surrogate = adaptive_sweep(n_initial=64, n_adaptive=64, batch_size=8, seed=0)
+    results_df.to_csv("forge_visibility_adaptive_sweep.csv", index=False)
+
+    # Dense surrogate map: far more points than were simulated
+    grid_unit = design(2**14, method="sobol", seed=1)
+    mean, std = surrogate.predict(grid_unit)
+    surrogate_df = pd.DataFrame(to_physical(grid_unit) * [p[3] for p in PARAMETERS],
+                                columns=[p[4] for p in PARAMETERS])
+    surrogate_df["visibility_mean"] = mean
+    surrogate_df["visibility_std"] = std
+    surrogate_df.to_csv("forge_visibility_surrogate.csv", index=False)
+
+    print(f"Simulations run: {len(results_df)}")
+    print(f"Fitted length scales (unit cube): {np.round(surrogate.length_scales, 3)}")
+    print(f"Surrogate std over the box: mean {np.mean(std):.4f}, max {np.max(std):.4f}")
+    print("Results saved to forge_visibility_adaptive_sweep.csv and forge_visibility_surrogate.csv")
@@ -0,0 +1,148 @@
+import numpy as np
+import matplotlib.pyplot as plt
+from scipy.ndimage import gaussian_filter1d
+from scipy.signal import find_peaks
+
+
+class TimeResolvedHistogram:
+    """2D (time slice × screen bin) detection histogram, accumulated chunk by chunk.
+
+    Detections must arrive roughly in time order (jitter of up to lag_slices slices
+    is tolerated). Slices that can no longer receive events are appended to `path`
+    as raw int64 rows, so only a few open slices are kept in memory.
+    With path=None, finished slices are kept in memory instead.
+    """
+
+    def __init__(self, num_bins, slice_width, path=None, t_start=0.0, lag_slices=1):
+        self.num_bins = num_bins
+        self.slice_width = slice_width
+        self.path = path
+        self.t_start = t_start
+        self.lag_slices = lag_slices
+        self.first_open = 0  # global index of the first slice still in memory
+        self.open_rows = np.zeros((0, num_bins), dtype=np.int64)
+        self.written_rows = []
+        self._file = open(path, "wb") if path is not None else None
+
+    def add(self, times, bins):
+        times = np.asarray(times, dtype=float)
+        if times.size == 0:
+            return
+        slices = np.maximum(np.floor((times - self.t_start) / self.slice_width).astype(np.int64), 0)
+        if slices.min() < self.first_open:
+            raise ValueError("Detection falls in a time slice that has already been written")
+
+        n_rows = slices.max() + 1 - self.first_open
+        if n_rows > len(self.open_rows):
+            grow = np.zeros((n_rows - len(self.open_rows), self.num_bins), dtype=np.int64)
+            self.open_rows = np.vstack([self.open_rows, grow])
+
+        flat = (slices - self.first_open) * self.num_bins + np.asarray(bins)
+        self.open_rows += np.bincount(flat, minlength=self.open_rows.size).reshape(-1, self.num_bins)
+
+        # Slices well before the newest event are complete
+        self._write(slices.max() - self.lag_slices - self.first_open)
+
+    def _write(self, n_done):
+        if n_done <= 0:
+            return
+        done, self.open_rows = self.open_rows[:n_done], self.open_rows[n_done:]
+        if self._file is not None:
+            done.tofile(self._file)
+            self._file.flush()
+        else:
+            self.written_rows.append(done)
+        self.first_open += n_done
+
+    def close(self):
+        """Write every remaining slice."""
+        self._write(len(self.open_rows))
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def counts(self):
+        """Full (time slice × screen bin) array: written slices followed by open ones."""
+        if self.path is not None:
+            if self._file is not None:
+                self._file.flush()
+            # Nothing flushed yet means an empty file, which cannot be memory-mapped
+            written = [load_time_resolved(self.path, self.num_bins)] if self.first_open else []
+        else:
+            written = self.written_rows
+        return np.vstack(written + [self.open_rows])
+
+    def slice_starts(self, n_slices):
+        return self.t_start + np.arange(n_slices) * self.slice_width
+
+
+def load_time_resolved(path, num_bins, mmap=True):
+    """Read a histogram written by TimeResolvedHistogram (memory-mapped by default)."""
+    if mmap:
+        return np.memmap(path, dtype=np.int64, mode="r").reshape(-1, num_bins)
+    return np.fromfile(path, dtype=np.int64).reshape(-1, num_bins)
+
+
+def fringe_visibility(counts, bin_positions, center_halfwidth=0.002, sigma=2, distance=10):
+    """Fringe visibility in the central region, as computed in pulse_no_dead_time.py."""
+    smooth_counts = gaussian_filter1d(np.asarray(counts, dtype=float), sigma=sigma)
+    center_mask = (bin_positions >= -center_halfwidth) & (bin_positions <= center_halfwidth)
+    central_counts = smooth_counts[center_mask]
+
+    peaks, _ = find_peaks(central_counts, distance=distance)
+    valleys, _ = find_peaks(-central_counts, distance=distance)
+    if len(peaks) == 0 or len(valleys) == 0:
+        return np.nan
+    I_max = np.max(central_counts[peaks])
+    I_min = np.min(central_counts[valleys])
+    return (I_max - I_min) / (I_max + I_min)
+
+
+def visibility_by_window(hist2d, bin_positions, window_slices, **kwargs):
+    """Visibility of consecutive windows of window_slices time slices each.
+
+    Returns (index of each window's first slice, visibility per window).
+    """
+    starts = np.arange(0, len(hist2d), window_slices)
+    window_counts = np.add.reduceat(np.asarray(hist2d), starts, axis=0)
+    return starts, np.array([fringe_visibility(c, bin_positions, **kwargs) for c in window_counts])
+
+
+if __name__ == "__main__":
+    import fast_kernels
+
+    # --- Parameters (pulse_no_dead_time.py, streamed in chunks) ---
+    num_chunks = 20
+    pulses_per_chunk = 1_000_000
+    slice_width = 0.1            # seconds per time slice
+    window_slices = 5            # slices per visibility window
+    num_bins = 1000
+    dark_time = 10e-6
+
+    state = {"t_end": 0.0, "last_detection_time": -np.inf}
+    histogram = TimeResolvedHistogram(num_bins, slice_width, path="time_resolved_counts.bin")
+    for _ in range(num_chunks):
+        bin_positions, _ = fast_kernels.pulse_slit(num_pulses=pulses_per_chunk, num_bins=num_bins,
+                                                   pulse_rate=1_000_000, dark_time=dark_time,
+                                                   state=state, time_resolved=histogram)
+    histogram.close()
+
+    hist2d = load_time_resolved("time_resolved_counts.bin", num_bins)
+    starts, visibility = visibility_by_window(hist2d, bin_positions, window_slices)
+    window_times = histogram.slice_starts(len(hist2d))[starts]
+
+    fig, axs = plt.subplots(2, 1, figsize=(10, 8))
+    axs[0].imshow(hist2d, aspect='auto', origin='lower', cmap='viridis',
+                  extent=[bin_positions[0] * 1e3, bin_positions[-1] * 1e3, 0, len(hist2d) * slice_width])
+    axs[0].set_xlabel("Screen position (mm)")
+    axs[0].set_ylabel("Time (s)")
+    axs[0].set_title("Time-Resolved Detection Histogram")
+    axs[1].plot(window_times, visibility, marker='o')
+    axs[1].set_xlabel("Window start (s)")
+    axs[1].set_ylabel("Fringe Visibility")
+    axs[1].grid(True)
+    plt.tight_layout()
+    plt.show()
+
+    print(f"Time slices written: {len(hist2d)}")
+    print(f"Total detections: {np.sum(hist2d)}")